@@ -1,10 +1,27 @@
 # backend/app.py
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, has_app_context, request, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-from datetime import datetime
+from flask_migrate import Migrate, stamp, upgrade
+from alembic.migration import MigrationContext
+from sqlalchemy import event
+import sqlalchemy.dialects.postgresql # Registers to_tsvector() & co. before SEARCH_VECTOR is built
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4 # Make sure this is present
+import base64
+import functools
+import hashlib
+import itertools
+import json
 import os
+import queue
+import re
+import sqlite3
+import threading
+import time
 
 app = Flask(__name__)
 
@@ -13,7 +30,47 @@ CORS(app, resources={r"/api/*": {"origins": CORS_ORIGIN}})
 
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///site.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+def env_flag(name, default):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes', 'on')
+
+def engine_options(database_uri):
+    """Connection pool settings, overridable through DB_* environment variables."""
+    options = {
+        'pool_pre_ping': env_flag('DB_POOL_PRE_PING', True),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        # Compiled-statement cache; psycopg2 has no server-side prepared statements,
+        # so this is where repeated queries save their compile cost
+        'query_cache_size': int(os.environ.get('DB_QUERY_CACHE_SIZE', 1200)),
+    }
+    if not database_uri.startswith('sqlite'):
+        options['pool_size'] = int(os.environ.get('DB_POOL_SIZE', 5))
+        options['max_overflow'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+        options['pool_timeout'] = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    if database_uri.startswith('postgresql+psycopg2') or database_uri.startswith('postgresql://'):
+        # Multi-row VALUES for bulk inserts and batched executemany for bulk updates
+        options['executemany_mode'] = 'values_plus_batch'
+    return options
+
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+app.config['SQLITE_MMAP_SIZE'] = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
 db = SQLAlchemy(app)
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+migrate = Migrate(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
+# Databases created with db.create_all() before migrations were wired up are at this revision
+BASELINE_REVISION = '5ffd8d790cac'
+
+@event.listens_for(Engine, 'connect')
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the single writer; NORMAL is durable under WAL
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute(f"PRAGMA mmap_size={app.config['SQLITE_MMAP_SIZE']}")
+    cursor.execute('PRAGMA busy_timeout=5000')
+    cursor.close()
 
 class Task(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
@@ -26,28 +83,653 @@ class Task(db.Model):
     note = db.Column(db.Text)
     status = db.Column(db.String(20), default='open', nullable=False)
     last_status_change_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # table_version value of the transaction that last wrote this row
+    sync_version = db.Column(db.Integer, default=0, nullable=False, index=True)
 
     def to_dict(self):
+        return Task.serialize(self)
+
+    @staticmethod
+    def serialize(row):
+        # Works on Task instances and on Core rows selected from the task table
         return {
-            "id": self.id,
-            "dateCreated": self.date_created.isoformat(),
-            "entityName": self.entity_name,
-            "taskType": self.task_type,
-            "time": self.time,
-            "contactPerson": self.contact_person,
-            "phoneNumber": self.phone_number,
-            "note": self.note,
-            "status": self.status,
-            "lastStatusChangeDate": self.last_status_change_date.isoformat()
+            "id": row.id,
+            "dateCreated": row.date_created.isoformat(),
+            "entityName": row.entity_name,
+            "taskType": row.task_type,
+            "time": row.time,
+            "contactPerson": row.contact_person,
+            "phoneNumber": row.phone_number,
+            "note": row.note,
+            "status": row.status,
+            "lastStatusChangeDate": row.last_status_change_date.isoformat(),
+            "updatedAt": row.updated_at.isoformat()
         }
 
-with app.app_context():
-    db.create_all() # This creates tables if they don't exist in site.db
+class TaskTombstone(db.Model):
+    # Records deleted task ids so /api/tasks/changes can tell clients to drop them
+    id = db.Column(db.String(36), primary_key=True)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    sync_version = db.Column(db.Integer, default=0, nullable=False, index=True)
+
+# Composite indexes backing the list filters and keyset pagination on (sort column, id)
+db.Index('ix_task_date_created_id', Task.date_created, Task.id)
+db.Index('ix_task_entity_name_id', Task.entity_name, Task.id)
+db.Index('ix_task_task_type_id', Task.task_type, Task.id)
+db.Index('ix_task_status_id', Task.status, Task.id)
+db.Index('ix_task_contact_person_id', db.func.coalesce(Task.contact_person, ''), Task.id)
+db.Index('ix_task_last_status_change_date_id', Task.last_status_change_date, Task.id)
+
+# Full-text search over entity name, contact person and note. Postgres uses a GIN
+# expression index (queries must repeat SEARCH_VECTOR exactly to hit it); SQLite
+# uses an external-content FTS5 table kept in sync by triggers, see SQLITE_SEARCH_DDL.
+SEARCH_VECTOR = db.func.to_tsvector(
+    db.text("'english'::regconfig"),
+    db.func.coalesce(Task.entity_name, '') + ' ' +
+    db.func.coalesce(Task.contact_person, '') + ' ' +
+    db.func.coalesce(Task.note, '')
+)
+db.Index('ix_task_search', SEARCH_VECTOR, postgresql_using='gin').ddl_if(dialect='postgresql')
+
+SQLITE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+        entity_name, contact_person, note,
+        content='task', content_rowid='rowid', tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, entity_name, contact_person, note)
+        VALUES (new.rowid, new.entity_name, new.contact_person, new.note);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, entity_name, contact_person, note)
+        VALUES ('delete', old.rowid, old.entity_name, old.contact_person, old.note);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF entity_name, contact_person, note ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, entity_name, contact_person, note)
+        VALUES ('delete', old.rowid, old.entity_name, old.contact_person, old.note);
+        INSERT INTO task_fts(rowid, entity_name, contact_person, note)
+        VALUES (new.rowid, new.entity_name, new.contact_person, new.note);
+    END""",
+]
+task_fts = db.table('task_fts', db.column('rowid'), db.column('rank'))
+
+class TableVersion(db.Model):
+    # One row per table; every write to that table bumps version and updated_at
+    __tablename__ = 'table_version'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+class TaskEvent(db.Model):
+    # Outbox of task changes, shared by all workers when TASK_EVENTS_BACKEND=database.
+    # AUTOINCREMENT stops SQLite reusing ids once pruning empties the table.
+    __tablename__ = 'task_event'
+    __table_args__ = {'sqlite_autoincrement': True}
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    payload = db.Column(db.Text, nullable=False)
+
+def init_db():
+    """Bring the schema up to date and seed the task version row.
+
+    A new database gets the current models from create_all() and is stamped at
+    the latest migration. An existing one is upgraded through the migrations,
+    from BASELINE_REVISION if it was never stamped. Runs once per deploy
+    (`flask --app app init-db`, or gunicorn's on_starting hook) rather than at
+    import time in every worker.
+    """
+    if not db.inspect(db.engine).has_table('task'):
+        db.create_all()
+        stamp(directory=MIGRATIONS_DIR)
+    else:
+        with db.engine.connect() as connection:
+            revision = MigrationContext.configure(connection).get_current_revision()
+        if revision is None:
+            stamp(directory=MIGRATIONS_DIR, revision=BASELINE_REVISION)
+        upgrade(directory=MIGRATIONS_DIR)
+    if db.engine.dialect.name == 'sqlite':
+        fts_exists = db.session.execute(db.text("SELECT 1 FROM sqlite_master WHERE name = 'task_fts'")).first()
+        for statement in SQLITE_SEARCH_DDL:
+            db.session.execute(db.text(statement))
+        if not fts_exists:
+            # Index any rows that were written before the search table existed
+            db.session.execute(db.text("INSERT INTO task_fts(task_fts) VALUES ('rebuild')"))
+        db.session.commit()
+    if not db.session.get(TableVersion, 'task'):
+        try:
+            db.session.add(TableVersion(name='task'))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback() # Another process seeded it first
+
+@app.cli.command('init-db')
+def init_db_command():
+    init_db()
+    print('Initialized the database.')
+
+def bump_task_version():
+    """Advance the task table version as part of the current transaction.
+
+    Returns the new version. The row stays locked until commit, so versions are
+    committed in increasing order and rows stamped with them (sync_version) can
+    be synced with a plain `sync_version > cursor` comparison.
+    """
+    now = datetime.utcnow()
+    result = db.session.execute(
+        db.update(TableVersion)
+        .where(TableVersion.name == 'task')
+        .values(version=TableVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        db.session.add(TableVersion(name='task', version=1, updated_at=now))
+        return 1
+    return db.session.scalar(db.select(TableVersion.version).where(TableVersion.name == 'task'))
+
+def current_task_version():
+    row = db.session.get(TableVersion, 'task', populate_existing=True)
+    return (row.version, row.updated_at) if row else (0, None)
+
+class ResponseCache:
+    """Thread-safe LRU of encoded response bodies, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        body, _ = entry
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[0])
+            self.entries[key] = entry
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (evicted, _) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+# Total body bytes cached per worker; every gunicorn worker holds its own cache
+app.config.setdefault('RESPONSE_CACHE_BYTES', int(os.environ.get('RESPONSE_CACHE_BYTES', 16 * 1024 * 1024)))
+app.config.setdefault('RESPONSE_CACHE_MAX_BODY', int(os.environ.get('RESPONSE_CACHE_MAX_BODY', 1024 * 1024)))
+response_cache = ResponseCache(app.config['RESPONSE_CACHE_BYTES'])
+
+# --- Task change events ---
+# Write handlers publish events inside their transaction; subscribers (the SSE
+# endpoint) receive them after commit. LocalBroker only reaches subscribers in
+# this process. DatabaseBroker writes events to the task_event table and a poller
+# thread in each worker fans new rows out, so events cross gunicorn workers.
+# Events only say what changed (type, task id or batch size, and the table
+# version); clients fetch the rows themselves through /api/tasks/changes.
+app.config.setdefault('TASK_EVENTS_BACKEND', os.environ.get('TASK_EVENTS_BACKEND', 'database'))
+app.config.setdefault('TASK_EVENTS_POLL_INTERVAL', float(os.environ.get('TASK_EVENTS_POLL_INTERVAL', 1.0)))
+app.config.setdefault('TASK_EVENTS_RETENTION', int(os.environ.get('TASK_EVENTS_RETENTION', 3600)))
+app.config.setdefault('TASK_EVENTS_PRUNE_INTERVAL', int(os.environ.get('TASK_EVENTS_PRUNE_INTERVAL', 60)))
+app.config.setdefault('TASK_EVENTS_RESCAN_WINDOW', int(os.environ.get('TASK_EVENTS_RESCAN_WINDOW', 1000)))
+app.config.setdefault('SSE_HEARTBEAT_INTERVAL', int(os.environ.get('SSE_HEARTBEAT_INTERVAL', 15)))
+
+class LocalBroker:
+    """In-process pub/sub for task events."""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_rollback', self._after_rollback)
+
+    def publish(self, events):
+        """Queue events for delivery once the current transaction commits."""
+        db.session.info.setdefault('task_events', []).extend(events)
+
+    def _after_commit(self, session):
+        events = session.info.pop('task_events', None)
+        if events:
+            self.dispatch([{"id": next(self.ids), **e} for e in events])
+
+    def _after_rollback(self, session):
+        session.info.pop('task_events', None)
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=1000)
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def replay(self, last_event_id):
+        return []
+
+    def dispatch(self, events):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            for e in events:
+                try:
+                    subscriber.put_nowait(e)
+                except queue.Full:
+                    break # Slow consumer; it can resync through /api/tasks/changes
+
+class DatabaseBroker(LocalBroker):
+    """Pub/sub across processes through the task_event table.
+
+    On Postgres, sequence ids are handed out at insert time but become visible
+    at commit, so a lower id can appear after a higher one was delivered. The
+    poller re-scans the last TASK_EVENTS_RESCAN_WINDOW ids and skips the ones it
+    has already dispatched; a late event further back than that is missed.
+
+    Writers prune events older than TASK_EVENTS_RETENTION at most once per
+    TASK_EVENTS_PRUNE_INTERVAL, so the table stays bounded whether or not this
+    worker has any subscribers.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.poller = None
+        self.last_id = None
+        self.dispatched = set()
+        self.pruned_at = None
+
+    def publish(self, events):
+        now = datetime.utcnow()
+        db.session.execute(db.insert(TaskEvent),
+                           [{"created_at": now, "payload": json.dumps(e)} for e in events])
+        if self.pruned_at is None or time.monotonic() - self.pruned_at > app.config['TASK_EVENTS_PRUNE_INTERVAL']:
+            self.pruned_at = time.monotonic()
+            cutoff = now - timedelta(seconds=app.config['TASK_EVENTS_RETENTION'])
+            db.session.execute(db.delete(TaskEvent).where(TaskEvent.created_at < cutoff))
+
+    def _after_commit(self, session):
+        pass
+
+    def subscribe(self):
+        subscriber = super().subscribe()
+        with self.lock:
+            if self.poller is None:
+                self.last_id = db.session.scalar(db.select(db.func.max(TaskEvent.id))) or 0
+                self.dispatched = set(db.session.scalars(db.select(TaskEvent.id).where(
+                    TaskEvent.id > self.last_id - app.config['TASK_EVENTS_RESCAN_WINDOW'])))
+                self.poller = threading.Thread(target=self.poll, name='task-events-poller', daemon=True)
+                self.poller.start()
+        return subscriber
+
+    def replay(self, last_event_id):
+        rows = db.session.execute(
+            db.select(TaskEvent.id, TaskEvent.payload).where(TaskEvent.id > last_event_id).order_by(TaskEvent.id)
+        )
+        return [{"id": row.id, **json.loads(row.payload)} for row in rows]
+
+    def poll(self):
+        while True:
+            try:
+                with app.app_context():
+                    window = app.config['TASK_EVENTS_RESCAN_WINDOW']
+                    ids = db.session.scalars(db.select(TaskEvent.id).where(TaskEvent.id > self.last_id - window))
+                    new_ids = set(ids) - self.dispatched
+                    rows = db.session.execute(
+                        db.select(TaskEvent.id, TaskEvent.payload).where(TaskEvent.id.in_(new_ids)).order_by(TaskEvent.id)
+                    ) if new_ids else []
+                    events = [{"id": row.id, **json.loads(row.payload)} for row in rows]
+                    if events:
+                        self.last_id = max(self.last_id, events[-1]["id"])
+                        self.dispatched.update(e["id"] for e in events)
+                        self.dispatch(events)
+                    self.dispatched = {i for i in self.dispatched if i > self.last_id - window}
+            except Exception:
+                app.logger.exception('Task event poller failed; retrying')
+            time.sleep(app.config['TASK_EVENTS_POLL_INTERVAL'])
+
+BROKERS = {'local': LocalBroker, 'database': DatabaseBroker}
+task_events = BROKERS[app.config['TASK_EVENTS_BACKEND']]()
+
+def conditional_get(build):
+    """Serve a GET keyed on the task table version.
+
+    Returns 304 when the client's ETag / Last-Modified is current, otherwise the
+    cached body for this version, building (and caching) it on a miss. Streamed
+    bodies and bodies over RESPONSE_CACHE_MAX_BODY bytes are never cached.
+    """
+    version, last_modified = current_task_version()
+    key = f"{version}|{request.full_path}|{request.headers.get('Accept', '')}"
+    etag = hashlib.sha1(key.encode()).hexdigest()
+    # HTTP dates have one-second resolution, so a Last-Modified from the current
+    # second could be followed by another write with the same truncated value.
+    # Only advertise and honour it once that second has passed; ETags cover the rest.
+    if last_modified and datetime.utcnow() - last_modified < timedelta(seconds=1):
+        last_modified = None
+
+    if request.if_none_match:
+        fresh = request.if_none_match.contains(etag)
+    else:
+        fresh = bool(last_modified and request.if_modified_since and
+                     last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since)
+
+    if fresh:
+        response = Response(status=304)
+    else:
+        cached = response_cache.get(key)
+        if cached is not None:
+            body, mimetype = cached
+            response = Response(body, mimetype=mimetype)
+        else:
+            response = app.make_response(build())
+            if response.status_code != 200:
+                return response
+            if not response.is_streamed and response.content_length <= app.config['RESPONSE_CACHE_MAX_BODY']:
+                response_cache.set(key, (response.get_data(), response.mimetype))
+
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    response.vary.add('Accept')
+    return response
+
+# Sortable columns, keyed by the camelCase names used in to_dict()
+SORT_COLUMNS = {
+    'dateCreated': Task.date_created,
+    'entityName': Task.entity_name,
+    'taskType': Task.task_type,
+    'status': Task.status,
+    'contactPerson': db.func.coalesce(Task.contact_person, ''),
+    'lastStatusChangeDate': Task.last_status_change_date,
+}
+DATETIME_SORT_KEYS = {'dateCreated', 'lastStatusChangeDate'}
+MAX_PAGE_SIZE = 500
+app.config.setdefault('TASKS_STREAM_BATCH_SIZE', int(os.environ.get('TASKS_STREAM_BATCH_SIZE', 1000)))
+
+def encode_cursor(value, task_id):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, task_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor, sort_key):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    value, task_id = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(task_id, str):
+        raise ValueError('cursor id must be a string')
+    if sort_key in DATETIME_SORT_KEYS:
+        value = datetime.fromisoformat(value)
+    elif sort_key == 'relevance':
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError('relevance cursor value must be a number')
+    elif not isinstance(value, str):
+        raise ValueError(f'cursor value for {sort_key} must be a string')
+    return value, task_id
+
+def filtered_tasks_query(args):
+    """Build a Task query from the list filters in the request args."""
+    query = Task.query
+    task_types = args.getlist('taskType')
+    if task_types:
+        query = query.filter(Task.task_type.in_(task_types))
+    entity_names = args.getlist('entityName')
+    if entity_names:
+        query = query.filter(Task.entity_name.in_(entity_names))
+    statuses = args.getlist('status')
+    if statuses:
+        query = query.filter(Task.status.in_([s.lower() for s in statuses]))
+    contact_persons = args.getlist('contactPerson')
+    if contact_persons:
+        query = query.filter(Task.contact_person.in_(contact_persons))
+    dates = args.getlist('date')
+    if dates:
+        # Day ranges instead of date() so the date_created index stays usable
+        days = [datetime.strptime(d, '%Y-%m-%d') for d in dates]
+        query = query.filter(db.or_(*[
+            db.and_(Task.date_created >= day, Task.date_created < day + timedelta(days=1))
+            for day in days
+        ]))
+    return query
+
+def search_tasks_query(query, q):
+    """Restrict the query to full-text matches for q; returns (query, rank).
+
+    Lower ranks are more relevant, so results sort on (rank, id) ascending like
+    any other keyset. rank is None when the database can't score matches.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        # Quote each word so user input can't inject FTS5 syntax; trailing * gives prefix matches
+        terms = ' '.join(f'"{word}"*' for word in re.findall(r'\w+', q))
+        if not terms:
+            return query.filter(db.false()), None
+        query = (query.join(task_fts, task_fts.c.rowid == db.literal_column('task.rowid'))
+                 .filter(db.text('task_fts MATCH :terms').bindparams(terms=terms)))
+        return query, task_fts.c.rank
+    if dialect == 'postgresql':
+        tsquery = db.func.websearch_to_tsquery(db.text("'english'::regconfig"), q)
+        query = query.filter(SEARCH_VECTOR.op('@@')(tsquery))
+        return query, -db.func.ts_rank(SEARCH_VECTOR, tsquery)
+    # Unindexed fallback for other databases
+    pattern = f'%{q}%'
+    query = query.filter(db.or_(Task.entity_name.ilike(pattern),
+                                Task.contact_person.ilike(pattern),
+                                Task.note.ilike(pattern)))
+    return query, None
+
+def stream_tasks(query, ndjson=False):
+    """Yield the query results as a JSON array or NDJSON, one batch of rows at a time."""
+    # Plain column rows skip the identity map; yield_per keeps only one batch in memory
+    # stream_results uses a server-side cursor on Postgres instead of buffering the result
+    rows = (query.with_entities(*Task.__table__.columns)
+            .execution_options(stream_results=True)
+            .yield_per(app.config['TASKS_STREAM_BATCH_SIZE']))
+    if ndjson:
+        for row in rows:
+            yield app.json.dumps(Task.serialize(row)) + '\n'
+        return
+
+    yield '['
+    first = True
+    for row in rows:
+        yield ('' if first else ',') + app.json.dumps(Task.serialize(row))
+        first = False
+    yield ']\n'
 
 @app.route('/api/tasks', methods=['GET'])
 def get_tasks():
-    tasks = Task.query.all()
-    return jsonify([task.to_dict() for task in tasks])
+    return conditional_get(list_tasks)
+
+def list_tasks():
+    sort_key = request.args.get('sort', 'dateCreated')
+    order = request.args.get('order', 'asc')
+    if sort_key not in SORT_COLUMNS:
+        return jsonify({"error": f"Invalid sort column: {sort_key}"}), 400
+    if order not in ('asc', 'desc'):
+        return jsonify({"error": "order must be 'asc' or 'desc'"}), 400
+
+    try:
+        query = filtered_tasks_query(request.args)
+    except ValueError:
+        return jsonify({"error": "date must be formatted as YYYY-MM-DD"}), 400
+
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return jsonify({"error": "limit must be a positive integer"}), 400
+    cursor = request.args.get('cursor')
+
+    rank = None
+    q = request.args.get('q', '').strip()
+    if q:
+        query, rank = search_tasks_query(query, q)
+    if rank is not None and 'sort' not in request.args:
+        # Relevance-ordered results page on (rank, id) the same way sorted listings do
+        limit = min(limit or MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+        if cursor:
+            try:
+                value, last_id = decode_cursor(cursor, 'relevance')
+            except (ValueError, TypeError):
+                return jsonify({"error": "Invalid cursor"}), 400
+            query = query.filter(db.tuple_(rank, Task.id) > (value, last_id))
+        rows = query.add_columns(rank).order_by(rank, Task.id).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last, last_rank = rows[-1]
+            next_cursor = encode_cursor(last_rank, last.id)
+        return jsonify({"tasks": [task.to_dict() for task, _ in rows], "nextCursor": next_cursor})
+
+    sort_column = SORT_COLUMNS[sort_key]
+    descending = order == 'desc'
+    if descending:
+        query = query.order_by(sort_column.desc(), Task.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Task.id.asc())
+
+    if limit is None and cursor is None:
+        # Unpaginated requests keep the original plain-array body, but streamed
+        ndjson = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+        mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+        return Response(stream_with_context(stream_tasks(query, ndjson)), mimetype=mimetype)
+
+    limit = min(limit or MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+    if cursor:
+        try:
+            value, last_id = decode_cursor(cursor, sort_key)
+        except (ValueError, TypeError):
+            return jsonify({"error": "Invalid cursor"}), 400
+        keyset = db.tuple_(sort_column, Task.id)
+        query = query.filter(keyset < (value, last_id) if descending else keyset > (value, last_id))
+
+    tasks = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        if sort_key == 'contactPerson':
+            next_cursor = encode_cursor(last.contact_person or '', last.id)
+        else:
+            next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+    return jsonify({"tasks": [task.to_dict() for task in tasks], "nextCursor": next_cursor})
+
+# Distinct-value counts for the filter dropdowns, cached per task table version
+FACET_COLUMNS = {
+    'entityName': Task.entity_name,
+    'taskType': Task.task_type,
+    'status': Task.status,
+    'contactPerson': Task.contact_person,
+    'date': db.func.date(Task.date_created),
+}
+def compute_facets():
+    facets = {}
+    for name, column in FACET_COLUMNS.items():
+        rows = db.session.query(column, db.func.count()).filter(column.isnot(None)).group_by(column).order_by(column).all()
+        facets[name] = [{"value": str(value), "count": count} for value, count in rows]
+    return facets
+
+@app.route('/api/tasks/facets', methods=['GET'])
+def get_task_facets():
+    return conditional_get(lambda: jsonify(compute_facets()))
+
+@app.route('/api/tasks/<string:task_id>', methods=['GET'])
+def get_task(task_id):
+    def build():
+        task = db.session.get(Task, task_id)
+        if not task:
+            return jsonify({"error": "Task not found"}), 404
+        return jsonify(task.to_dict())
+    return conditional_get(build)
+
+@app.route('/api/tasks/changes', methods=['GET'])
+def get_task_changes():
+    """Tasks created/updated and ids deleted after the `since` cursor.
+
+    The cursor is the task table version returned by the previous call. Each
+    write stamps its rows with the version it bumped, and versions commit in
+    order, so every change after the cursor is delivered exactly once. Without
+    `since` every task is returned, which gives a new client its initial
+    snapshot and first cursor. The task list is streamed like /api/tasks.
+    """
+    since = request.args.get('since')
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return jsonify({"error": "since must be a cursor returned by this endpoint"}), 400
+
+    def build():
+        # Read the version first: every row stamped with it or lower is already committed
+        cursor, _ = current_task_version()
+        tasks_query = Task.query.filter(Task.sync_version <= cursor).order_by(Task.sync_version, Task.id)
+        deleted = []
+        if since is not None:
+            tasks_query = tasks_query.filter(Task.sync_version > since)
+            deleted = list(db.session.scalars(db.select(TaskTombstone.id).where(
+                TaskTombstone.sync_version > since, TaskTombstone.sync_version <= cursor)))
+
+        def generate():
+            yield f'{{"cursor": {app.json.dumps(str(cursor))}, "deleted": {app.json.dumps(deleted)}, "tasks": '
+            yield from stream_tasks(tasks_query)
+            yield '}\n'
+        return Response(stream_with_context(generate()), mimetype='application/json')
+    return conditional_get(build)
+
+def format_sse(e):
+    return f"id: {e['id']}\nevent: {e['type']}\ndata: {json.dumps(e)}\n\n"
+
+@app.route('/api/tasks/stream', methods=['GET'])
+def stream_task_events():
+    """Server-Sent Events feed of task creates, updates and deletes.
+
+    Reconnecting clients send Last-Event-ID and, with the database backend,
+    get the events they missed replayed first.
+    """
+    subscriber = task_events.subscribe()
+    last_event_id = request.headers.get('Last-Event-ID', type=int) or 0
+    backlog = task_events.replay(last_event_id) if last_event_id else []
+    heartbeat = app.config['SSE_HEARTBEAT_INTERVAL']
+
+    def generate():
+        # Ids are not delivered in strict order (see DatabaseBroker), so only skip
+        # live events that were already sent as part of the replayed backlog
+        replayed = {e["id"] for e in backlog}
+        try:
+            yield 'retry: 3000\n\n'
+            for e in backlog:
+                yield format_sse(e)
+            while True:
+                try:
+                    e = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if e["id"] not in replayed:
+                    yield format_sse(e)
+        finally:
+            task_events.unsubscribe(subscriber)
+
+    # Nothing in the loop touches the database, so release the session's connection now
+    db.session.remove()
+    response = Response(generate(), mimetype='text/event-stream')
+    response.cache_control.no_cache = True
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/api/tasks', methods=['POST'])
 def create_task():
@@ -55,6 +737,7 @@ def create_task():
     if not data or not all(key in data for key in ['entityName', 'taskType']):
         return jsonify({"error": "Missing entityName or taskType"}), 400
 
+    version = bump_task_version()
     new_task = Task(
         entity_name=data['entityName'],
         task_type=data['taskType'],
@@ -63,9 +746,12 @@ def create_task():
         phone_number=data.get('phoneNumber'),
         status=data.get('status', 'open'),
         note=data.get('note'),
-        last_status_change_date=datetime.utcnow()
+        last_status_change_date=datetime.utcnow(),
+        sync_version=version
     )
     db.session.add(new_task)
+    db.session.flush()
+    task_events.publish([{"type": "created", "taskId": new_task.id, "version": version}])
     db.session.commit()
     return jsonify(new_task.to_dict()), 201
 
@@ -76,6 +762,7 @@ def update_task(task_id):
     if not task_to_update:
         return jsonify({"error": "Task not found"}), 404
 
+    version = task_to_update.sync_version = bump_task_version()
     old_status = task_to_update.status
     new_status = data.get('status', old_status)
 
@@ -92,6 +779,8 @@ def update_task(task_id):
     else:
         task_to_update.status = new_status
 
+    db.session.flush()
+    task_events.publish([{"type": "updated", "taskId": task_id, "version": version}])
     db.session.commit()
     return jsonify(task_to_update.to_dict()), 200
 
@@ -101,9 +790,269 @@ def delete_task(task_id):
     if not task_to_delete:
         return jsonify({"error": "Task not found"}), 404
 
+    version = bump_task_version()
     db.session.delete(task_to_delete)
+    db.session.add(TaskTombstone(id=task_id, sync_version=version))
+    task_events.publish([{"type": "deleted", "taskId": task_id, "version": version}])
     db.session.commit()
     return jsonify({"message": "Task deleted successfully"}), 200
 
+# --- Bulk endpoints ---
+# Each request is validated in one pass, written with executemany / id-list
+# statements and committed once per BULK_BATCH_SIZE items.
+app.config.setdefault('BULK_BATCH_SIZE', int(os.environ.get('BULK_BATCH_SIZE', 1000)))
+EDITABLE_FIELDS = {
+    'entityName': 'entity_name',
+    'taskType': 'task_type',
+    'time': 'time',
+    'contactPerson': 'contact_person',
+    'phoneNumber': 'phone_number',
+    'note': 'note',
+    'status': 'status',
+}
+
+def batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def task_field_error(data):
+    """Return why an editable field in data can't be written, or None if all are valid."""
+    for field, column_name in EDITABLE_FIELDS.items():
+        if field not in data:
+            continue
+        value = data[field]
+        column = Task.__table__.columns[column_name]
+        if value is None:
+            if not column.nullable:
+                return f"{field} cannot be null"
+            continue
+        if not isinstance(value, str):
+            return f"{field} must be a string"
+        length = getattr(column.type, 'length', None)
+        if length and len(value) > length:
+            return f"{field} must be at most {length} characters"
+    return None
+
+def bulk_payload(key):
+    """Return the list sent in the request body, either bare or under `key`."""
+    data = request.json
+    if isinstance(data, dict):
+        data = data.get(key)
+    return data if isinstance(data, list) else None
+
+@app.route('/api/tasks/bulk', methods=['POST'])
+def bulk_create_tasks():
+    items = bulk_payload('tasks')
+    if items is None:
+        return jsonify({"error": "Expected a list of tasks"}), 400
+
+    results = [None] * len(items)
+    rows = []
+    for index, data in enumerate(items):
+        if not isinstance(data, dict) or not all(data.get(key) for key in ['entityName', 'taskType']):
+            results[index] = {"index": index, "status": 400, "error": "Missing entityName or taskType"}
+            continue
+        # A null status falls back to 'open', as in create_task
+        error = task_field_error({**data, 'status': data.get('status') or 'open'})
+        if error:
+            results[index] = {"index": index, "status": 400, "error": error}
+            continue
+        now = datetime.utcnow()
+        row = {column: data.get(field) for field, column in EDITABLE_FIELDS.items()}
+        row.update(id=str(uuid4()), date_created=now, last_status_change_date=now,
+                   updated_at=now, status=data.get('status') or 'open')
+        rows.append((index, row))
+
+    for batch in batches(rows, app.config['BULK_BATCH_SIZE']):
+        version = bump_task_version()
+        for _, row in batch:
+            row['sync_version'] = version
+        db.session.execute(db.insert(Task), [row for _, row in batch])
+        for index, row in batch:
+            results[index] = {"index": index, "status": 201, "task": Task.serialize(Task(**row))}
+        # One summary event per batch; subscribers sync the rows through /api/tasks/changes
+        task_events.publish([{"type": "created", "count": len(batch), "version": version}])
+        db.session.commit()
+
+    return jsonify({"results": results}), 200
+
+@app.route('/api/tasks/bulk', methods=['PUT'])
+def bulk_update_tasks():
+    items = bulk_payload('tasks')
+    if items is None:
+        return jsonify({"error": "Expected a list of tasks"}), 400
+
+    results = [None] * len(items)
+    updates = []
+    for index, data in enumerate(items):
+        if not isinstance(data, dict) or not isinstance(data.get('id'), str):
+            results[index] = {"index": index, "status": 400, "error": "Missing id"}
+            continue
+        error = task_field_error(data)
+        if error:
+            results[index] = {"index": index, "status": 400, "error": error}
+            continue
+        updates.append((index, data))
+
+    columns = Task.__table__.columns
+    for batch in batches(updates, app.config['BULK_BATCH_SIZE']):
+        ids = {data['id'] for _, data in batch}
+        existing = {row.id: row._asdict() for row in
+                    db.session.execute(db.select(*columns).where(Task.id.in_(ids)))}
+
+        params = []
+        for index, data in batch:
+            current = existing.get(data['id'])
+            if current is None:
+                results[index] = {"index": index, "status": 404, "error": "Task not found"}
+                continue
+            changes = {column: data[field] for field, column in EDITABLE_FIELDS.items() if field in data}
+            changes['updated_at'] = datetime.utcnow()
+            # Same rule as update_task: only a real status change moves the timestamp
+            if 'status' in changes and changes['status'] != current['status']:
+                changes['last_status_change_date'] = changes['updated_at']
+            current.update(changes)
+            params.append({"id": data['id'], **changes})
+            results[index] = {"index": index, "status": 200, "task": Task.serialize(Task(**current))}
+
+        if params:
+            version = bump_task_version()
+            db.session.execute(db.update(Task), [{**p, "sync_version": version} for p in params])
+            task_events.publish([{"type": "updated", "count": len(params), "version": version}])
+        db.session.commit()
+    return jsonify({"results": results}), 200
+
+@app.route('/api/tasks/bulk', methods=['DELETE'])
+def bulk_delete_tasks():
+    ids = bulk_payload('ids')
+    if ids is None:
+        return jsonify({"error": "Expected a list of ids"}), 400
+
+    results = []
+    for batch in batches(list(enumerate(ids)), app.config['BULK_BATCH_SIZE']):
+        batch_ids = {task_id for _, task_id in batch if isinstance(task_id, str)}
+        found = set(db.session.scalars(db.select(Task.id).where(Task.id.in_(batch_ids))))
+        if found:
+            version = bump_task_version()
+            db.session.execute(db.delete(Task).where(Task.id.in_(found)))
+            now = datetime.utcnow()
+            db.session.execute(db.insert(TaskTombstone),
+                               [{"id": task_id, "deleted_at": now, "sync_version": version} for task_id in found])
+            task_events.publish([{"type": "deleted", "count": len(found), "version": version}])
+        db.session.commit()
+        for index, task_id in batch:
+            if not isinstance(task_id, str):
+                results.append({"index": index, "id": task_id, "status": 400, "error": "id must be a string"})
+            elif task_id in found:
+                results.append({"index": index, "id": task_id, "status": 200})
+                found.discard(task_id)
+            else:
+                results.append({"index": index, "id": task_id, "status": 404, "error": "Task not found"})
+
+    return jsonify({"results": results}), 200
+
+# --- Per-request profiling (opt-in with METRICS_ENABLED=1) ---
+# Records SQL statement count, SQL time, serialization time (Task.serialize plus
+# JSON encoding) and total time per request, aggregated per endpoint on /metrics.
+app.config.setdefault('METRICS_ENABLED', env_flag('METRICS_ENABLED', False))
+app.config.setdefault('METRICS_WINDOW', int(os.environ.get('METRICS_WINDOW', 1000)))
+METRICS_EXCLUDED_ENDPOINTS = {'get_metrics', 'stream_task_events'}
+
+class EndpointMetrics:
+    """Running totals plus a window of recent durations for percentiles."""
+
+    def __init__(self, window):
+        self.count = 0
+        self.total_time = 0.0
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, sample):
+        self.count += 1
+        self.total_time += sample['total_time']
+        self.sql_count += sample['sql_count']
+        self.sql_time += sample['sql_time']
+        self.serialization_time += sample['serialization_time']
+        self.recent.append(sample['total_time'])
+
+    def to_dict(self):
+        recent = sorted(self.recent)
+        def percentile(p):
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 3) if recent else None
+        per_request = lambda value: round(value / self.count, 3) if self.count else None
+        return {
+            "requests": self.count,
+            "p50Ms": percentile(0.50),
+            "p99Ms": percentile(0.99),
+            "meanMs": per_request(self.total_time * 1000),
+            "sqlQueriesPerRequest": per_request(self.sql_count),
+            "sqlMsPerRequest": per_request(self.sql_time * 1000),
+            "serializationMsPerRequest": per_request(self.serialization_time * 1000),
+        }
+
+request_metrics = {}
+request_metrics_lock = threading.Lock()
+
+def current_sample():
+    return g.get('metrics_sample') if has_app_context() else None
+
+def timed_serialization(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        sample = current_sample()
+        if sample is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sample['serialization_time'] += time.perf_counter() - start
+    return wrapper
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info['query_start'].pop()
+    sample = current_sample()
+    if sample is not None:
+        sample['sql_count'] += 1
+        sample['sql_time'] += time.perf_counter() - start
+
+def start_request_sample():
+    g.metrics_sample = {'start': time.perf_counter(), 'sql_count': 0, 'sql_time': 0.0, 'serialization_time': 0.0}
+
+def finish_request_sample(response):
+    sample = g.get('metrics_sample')
+    endpoint = request.endpoint
+    if sample is None or endpoint is None or endpoint in METRICS_EXCLUDED_ENDPOINTS:
+        return response
+
+    def record():
+        # Runs once the body has been sent, so streamed responses are fully counted
+        sample['total_time'] = time.perf_counter() - sample['start']
+        with request_metrics_lock:
+            metrics = request_metrics.setdefault(endpoint, EndpointMetrics(app.config['METRICS_WINDOW']))
+            metrics.add(sample)
+    response.call_on_close(record)
+    return response
+
+def get_metrics():
+    with request_metrics_lock:
+        return jsonify({endpoint: metrics.to_dict() for endpoint, metrics in sorted(request_metrics.items())})
+
+if app.config['METRICS_ENABLED']:
+    Task.serialize = staticmethod(timed_serialization(Task.serialize))
+    app.json.dumps = timed_serialization(app.json.dumps)
+    event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+    app.before_request(start_request_sample)
+    app.after_request(finish_request_sample)
+    app.add_url_rule('/metrics', 'get_metrics', get_metrics, methods=['GET'])
+
 if __name__ == '__main__':
+    with app.app_context():
+        init_db()
     app.run(debug=True, host='0.0.0.0', port=os.environ.get('PORT', 5000))
\ No newline at end of file
@@ -0,0 +1,270 @@
+# backend/benchmark.py
+"""Load-test harness for the tasks API.
+
+Seeds N synthetic tasks, then drives the list, create, update and delete
+endpoints through the Flask test client and, with --gunicorn, through a real
+gunicorn process. Reports p50/p99 latency, throughput and peak RSS.
+
+    python benchmark.py --rows 100000
+    python benchmark.py --rows 100000 --gunicorn --concurrency 16 --profile
+    DATABASE_URL=postgresql://... python benchmark.py --reset
+
+The database comes from DATABASE_URL (a throwaway SQLite file by default).
+Existing tasks are left alone: the update and delete scenarios only touch the
+tasks seeded by this run. --reset deletes every task first, through tombstones
+like the API does, so only pass it for a database you mean to empty. The
+in-process response cache is disabled so reads measure real work; pass
+--response-cache to measure with it. --profile turns on the /metrics
+instrumentation and prints its per-endpoint SQL and serialization breakdown.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import quote
+from uuid import uuid4
+import argparse
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ENTITY_NAMES = [f'Entity {i}' for i in range(500)]
+CONTACT_PERSONS = [f'Contact {i}' for i in range(200)] + [None]
+TASK_TYPES = ['Call', 'Meeting', 'Video Call']
+NOTE_WORDS = 'invoice renewal contract follow up quarterly review payment onboarding demo pricing'.split()
+
+
+def synthetic_task(now):
+    created = now - timedelta(minutes=random.randint(0, 60 * 24 * 365))
+    return {
+        "id": str(uuid4()),
+        "date_created": created,
+        "entity_name": random.choice(ENTITY_NAMES),
+        "task_type": random.choice(TASK_TYPES),
+        "time": f'{random.randint(0, 23):02d}:{random.choice(["00", "30"])}',
+        "contact_person": random.choice(CONTACT_PERSONS),
+        "phone_number": f'555-{random.randint(1000, 9999)}',
+        "note": ' '.join(random.choices(NOTE_WORDS, k=8)),
+        "status": random.choice(['open', 'closed']),
+        "last_status_change_date": created,
+        "updated_at": created,
+    }
+
+
+def reset(app):
+    """Delete every task, leaving tombstones so /api/tasks/changes clients drop them too."""
+    from app import db, bump_task_version, Task, TaskTombstone
+    with app.app_context():
+        version = bump_task_version()
+        db.session.execute(db.insert(TaskTombstone).from_select(
+            ['id', 'deleted_at', 'sync_version'],
+            db.select(Task.id, db.literal(datetime.utcnow()), db.literal(version))))
+        db.session.execute(db.delete(Task))
+        db.session.commit()
+
+
+def seed(app, rows, batch_size=5000):
+    """Insert synthetic tasks, one table version per batch; returns their ids."""
+    from app import db, bump_task_version, Task
+    task_ids = []
+    with app.app_context():
+        now = datetime.utcnow()
+        for start in range(0, rows, batch_size):
+            version = bump_task_version()
+            batch = [{**synthetic_task(now), "sync_version": version} for _ in range(min(batch_size, rows - start))]
+            db.session.execute(db.insert(Task), batch)
+            db.session.commit()
+            task_ids += [task["id"] for task in batch]
+    return task_ids
+
+
+def summarize(name, latencies, elapsed):
+    latencies = sorted(latencies)
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "p50Ms": round(percentile(0.50), 2),
+        "p99Ms": round(percentile(0.99), 2),
+        "throughputRps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+def new_task_payload():
+    return {"entityName": random.choice(ENTITY_NAMES), "taskType": random.choice(TASK_TYPES),
+            "contactPerson": random.choice(CONTACT_PERSONS), "note": ' '.join(random.choices(NOTE_WORDS, k=8))}
+
+
+def scenarios(task_ids, requests):
+    """(name, count, request factory) tuples; each factory returns (method, path, json body)."""
+    return [
+        ('list page', requests,
+         lambda i: ('GET', f'/api/tasks?limit=100&sort={random.choice(["dateCreated", "entityName", "status"])}', None)),
+        ('list filtered', requests,
+         lambda i: ('GET', f'/api/tasks?limit=100&taskType={quote(random.choice(TASK_TYPES))}&status=open', None)),
+        ('list full', max(1, requests // 20), lambda i: ('GET', '/api/tasks', None)),
+        ('create', requests, lambda i: ('POST', '/api/tasks', new_task_payload())),
+        ('update', requests,
+         lambda i: ('PUT', f'/api/tasks/{random.choice(task_ids)}', {"status": random.choice(['open', 'closed'])})),
+        ('delete', requests, lambda i: ('DELETE', f'/api/tasks/{task_ids.pop()}', None)),
+    ]
+
+
+def run_test_client(app, task_ids, requests):
+    client = app.test_client()
+    results = []
+    for name, count, make_request in scenarios(task_ids, requests):
+        latencies = []
+        started = time.perf_counter()
+        for i in range(count):
+            method, path, body = make_request(i)
+            start = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            response.get_data()
+            response.close()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                raise RuntimeError(f'{method} {path} returned {response.status_code}')
+        results.append(summarize(name, latencies, time.perf_counter() - started))
+    return results
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def process_tree(pid):
+    children = []
+    for task in os.listdir(f'/proc/{pid}/task'):
+        with open(f'/proc/{pid}/task/{task}/children') as f:
+            children += [int(child) for child in f.read().split()]
+    return [pid] + [p for child in children for p in process_tree(child)]
+
+
+def peak_rss_kb(pid):
+    """Sum of VmHWM over a process and its children (Linux only, None elsewhere)."""
+    total = 0
+    try:
+        for p in process_tree(pid):
+            with open(f'/proc/{p}/status') as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        return None
+    return total
+
+
+def run_gunicorn(task_ids, requests, concurrency, workers):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app:app'],
+                              cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f'{base_url}/api/tasks?limit=1', timeout=1).read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError('gunicorn did not start')
+
+        def send(make_request, i):
+            method, path, body = make_request(i)
+            data = json.dumps(body).encode() if body is not None else None
+            req = urllib.request.Request(base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+            start = time.perf_counter()
+            with urllib.request.urlopen(req) as response:
+                response.read()
+            return time.perf_counter() - start
+
+        results = []
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for name, count, make_request in scenarios(task_ids, requests):
+                started = time.perf_counter()
+                latencies = list(pool.map(lambda i: send(make_request, i), range(count)))
+                results.append(summarize(name, latencies, time.perf_counter() - started))
+        return results, peak_rss_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def print_table(title, results, rss_kb):
+    print(f'\n{title}')
+    print(f'{"scenario":<16}{"requests":>10}{"p50 ms":>10}{"p99 ms":>10}{"req/s":>10}')
+    for r in results:
+        print(f'{r["scenario"]:<16}{r["requests"]:>10}{r["p50Ms"]:>10}{r["p99Ms"]:>10}{r["throughputRps"]:>10}')
+    if rss_kb is not None:
+        print(f'peak RSS: {rss_kb / 1024:.1f} MiB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='synthetic tasks to seed')
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--gunicorn', action='store_true', help='also benchmark a real gunicorn process')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent clients against gunicorn')
+    parser.add_argument('--profile', action='store_true', help='enable per-request metrics and print them')
+    parser.add_argument('--response-cache', action='store_true', help='leave the in-process response cache on')
+    parser.add_argument('--reset', action='store_true', help='delete every existing task before seeding')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for reproducible data')
+    parser.add_argument('--json', dest='json_path', help='also write the results to this file')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    if 'DATABASE_URL' not in os.environ:
+        os.environ['DATABASE_URL'] = f'sqlite:///{tempfile.mkdtemp()}/benchmark.db'
+    if args.profile:
+        os.environ['METRICS_ENABLED'] = '1'
+    if not args.response_cache:
+        os.environ['RESPONSE_CACHE_BYTES'] = '0'
+
+    from app import app, init_db
+    with app.app_context():
+        init_db()
+
+    if args.reset:
+        reset(app)
+    started = time.perf_counter()
+    task_ids = seed(app, args.rows)
+    print(f'seeded {args.rows} tasks into {os.environ["DATABASE_URL"]} in {time.perf_counter() - started:.1f}s')
+
+    report = {"rows": args.rows, "database": os.environ['DATABASE_URL']}
+    random.shuffle(task_ids)
+    report['testClient'] = run_test_client(app, task_ids, args.requests)
+    report['testClientPeakRssKb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print_table('Flask test client', report['testClient'], report['testClientPeakRssKb'])
+
+    if app.config['METRICS_ENABLED']:
+        with app.test_client() as client:
+            report['metrics'] = client.get('/metrics').get_json()
+        print('\nper-endpoint profile (test client):')
+        for endpoint, metrics in report['metrics'].items():
+            print(f'  {endpoint:<20} sql {metrics["sqlQueriesPerRequest"]} queries / {metrics["sqlMsPerRequest"]} ms, '
+                  f'serialization {metrics["serializationMsPerRequest"]} ms, mean {metrics["meanMs"]} ms')
+
+    if args.gunicorn:
+        report['gunicorn'], report['gunicornPeakRssKb'] = run_gunicorn(
+            task_ids, args.requests, args.concurrency, args.workers)
+        print_table(f'gunicorn ({args.workers} workers, {args.concurrency} clients)',
+                    report['gunicorn'], report['gunicornPeakRssKb'])
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
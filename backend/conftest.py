@@ -0,0 +1,43 @@
+# backend/conftest.py
+import os
+import tempfile
+
+# Point the app at a throwaway database before it is imported
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+os.environ['TASK_EVENTS_BACKEND'] = 'local'
+
+import pytest
+
+from app import app as flask_app, db, init_db, response_cache, TableVersion
+
+
+@pytest.fixture(scope='session')
+def schema():
+    with flask_app.app_context():
+        init_db()
+
+
+@pytest.fixture
+def app(schema):
+    with flask_app.app_context():
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.add(TableVersion(name='task'))
+        db.session.commit()
+    response_cache.clear()
+    yield flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def create_task(client):
+    def create(**fields):
+        payload = {"entityName": "Acme", "taskType": "Call", **fields}
+        response = client.post('/api/tasks', json=payload)
+        assert response.status_code == 201
+        return response.get_json()
+    return create
@@ -0,0 +1,29 @@
+# backend/gunicorn.conf.py -- picked up automatically by `gunicorn app:app`
+import multiprocessing
+import os
+import subprocess
+import sys
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# gevent lets each worker hold thousands of idle /api/tasks/stream connections
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+
+def on_starting(server):
+    # Create the schema once, before any worker is forked. It runs in a child
+    # process so the master never imports app: workers must import it themselves,
+    # after gevent has monkey-patched threading, or its locks block the whole worker.
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'],
+                   cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent' and os.environ.get('DATABASE_URL', '').startswith('postgres'):
+        # Make psycopg2 yield to the gevent hub instead of blocking the whole worker
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
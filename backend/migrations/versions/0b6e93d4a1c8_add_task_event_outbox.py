@@ -0,0 +1,35 @@
+"""Add task_event outbox for Server-Sent Events fan-out
+
+Revision ID: 0b6e93d4a1c8
+Revises: f27d5b8a0c94
+Create Date: 2026-10-18 18:36:12.954023
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6e93d4a1c8'
+down_revision = 'f27d5b8a0c94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_event',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True
+    )
+    with op.batch_alter_table('task_event', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_task_event_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_event', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_task_event_created_at'))
+
+    op.drop_table('task_event')
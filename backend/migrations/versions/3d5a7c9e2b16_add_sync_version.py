@@ -0,0 +1,40 @@
+"""Add sync_version to task and task_tombstone for commit-ordered sync cursors
+
+Revision ID: 3d5a7c9e2b16
+Revises: 0b6e93d4a1c8
+Create Date: 2026-10-18 20:05:41.662318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d5a7c9e2b16'
+down_revision = '0b6e93d4a1c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sync_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_task_sync_version'), ['sync_version'], unique=False)
+
+    with op.batch_alter_table('task_tombstone', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sync_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_task_tombstone_sync_version'), ['sync_version'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_tombstone', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_task_tombstone_sync_version'))
+        batch_op.drop_column('sync_version')
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_task_sync_version'))
+        batch_op.drop_column('sync_version')
+
+    # The batch rebuild that drops the column can't carry over the expression index
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("CREATE INDEX IF NOT EXISTS ix_task_contact_person_id ON task (coalesce(contact_person, ''), id)")
@@ -0,0 +1,39 @@
+"""Add composite indexes for task list filtering and keyset pagination
+
+Revision ID: a3c1e7f29b4d
+Revises: 5ffd8d790cac
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c1e7f29b4d'
+down_revision = '5ffd8d790cac'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_date_created_id', ['date_created', 'id'], unique=False)
+        batch_op.create_index('ix_task_entity_name_id', ['entity_name', 'id'], unique=False)
+        batch_op.create_index('ix_task_task_type_id', ['task_type', 'id'], unique=False)
+        batch_op.create_index('ix_task_status_id', ['status', 'id'], unique=False)
+        batch_op.create_index('ix_task_last_status_change_date_id', ['last_status_change_date', 'id'], unique=False)
+
+    op.create_index('ix_task_contact_person_id', 'task',
+                    [sa.text("coalesce(contact_person, '')"), 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_contact_person_id', table_name='task')
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_last_status_change_date_id')
+        batch_op.drop_index('ix_task_status_id')
+        batch_op.drop_index('ix_task_task_type_id')
+        batch_op.drop_index('ix_task_entity_name_id')
+        batch_op.drop_index('ix_task_date_created_id')
@@ -0,0 +1,30 @@
+"""Add table_version for ETag / Last-Modified tracking
+
+Revision ID: c84b2d0e6f11
+Revises: a3c1e7f29b4d
+Create Date: 2026-10-18 11:47:05.502917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c84b2d0e6f11'
+down_revision = 'a3c1e7f29b4d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_version = op.create_table('table_version',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute(table_version.insert().values(name='task', version=0, updated_at=sa.func.now()))
+
+
+def downgrade():
+    op.drop_table('table_version')
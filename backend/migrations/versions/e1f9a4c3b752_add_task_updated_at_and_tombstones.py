@@ -0,0 +1,48 @@
+"""Add task.updated_at and task_tombstone for incremental sync
+
+Revision ID: e1f9a4c3b752
+Revises: c84b2d0e6f11
+Create Date: 2026-10-18 14:03:26.881440
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f9a4c3b752'
+down_revision = 'c84b2d0e6f11'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Added NOT NULL with a constant default so SQLite can ALTER in place; a batch
+    # rebuild would drop ix_task_contact_person_id, which Alembic can't reflect
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default='1970-01-01 00:00:00', nullable=False))
+
+    # Existing rows were last touched no earlier than their last status change
+    op.execute('UPDATE task SET updated_at = last_status_change_date')
+
+    op.create_table('task_tombstone',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('task_tombstone', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_task_tombstone_deleted_at'), ['deleted_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_tombstone', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_task_tombstone_deleted_at'))
+
+    op.drop_table('task_tombstone')
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    # The batch rebuild that drops the column can't carry over the expression index
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("CREATE INDEX IF NOT EXISTS ix_task_contact_person_id ON task (coalesce(contact_person, ''), id)")
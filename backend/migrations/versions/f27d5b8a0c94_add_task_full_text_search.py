@@ -0,0 +1,59 @@
+"""Add full-text search index over task entity name, contact person and note
+
+Revision ID: f27d5b8a0c94
+Revises: e1f9a4c3b752
+Create Date: 2026-10-18 16:21:54.307612
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f27d5b8a0c94'
+down_revision = 'e1f9a4c3b752'
+branch_labels = None
+depends_on = None
+
+# Must match SEARCH_VECTOR in app.py for the planner to use the index
+POSTGRES_SEARCH_VECTOR = (
+    "to_tsvector('english'::regconfig, coalesce(entity_name, '') || ' ' || "
+    "coalesce(contact_person, '') || ' ' || coalesce(note, ''))"
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(f'CREATE INDEX ix_task_search ON task USING gin ({POSTGRES_SEARCH_VECTOR})')
+    elif dialect == 'sqlite':
+        op.execute("""CREATE VIRTUAL TABLE task_fts USING fts5(
+            entity_name, contact_person, note,
+            content='task', content_rowid='rowid', tokenize='porter unicode61 remove_diacritics 2'
+        )""")
+        op.execute("""CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN
+            INSERT INTO task_fts(rowid, entity_name, contact_person, note)
+            VALUES (new.rowid, new.entity_name, new.contact_person, new.note);
+        END""")
+        op.execute("""CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN
+            INSERT INTO task_fts(task_fts, rowid, entity_name, contact_person, note)
+            VALUES ('delete', old.rowid, old.entity_name, old.contact_person, old.note);
+        END""")
+        op.execute("""CREATE TRIGGER task_fts_au AFTER UPDATE OF entity_name, contact_person, note ON task BEGIN
+            INSERT INTO task_fts(task_fts, rowid, entity_name, contact_person, note)
+            VALUES ('delete', old.rowid, old.entity_name, old.contact_person, old.note);
+            INSERT INTO task_fts(rowid, entity_name, contact_person, note)
+            VALUES (new.rowid, new.entity_name, new.contact_person, new.note);
+        END""")
+        op.execute("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_task_search', table_name='task')
+    elif dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS task_fts_au')
+        op.execute('DROP TRIGGER IF EXISTS task_fts_ad')
+        op.execute('DROP TRIGGER IF EXISTS task_fts_ai')
+        op.execute('DROP TABLE IF EXISTS task_fts')
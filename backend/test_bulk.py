@@ -0,0 +1,116 @@
+# backend/test_bulk.py
+def results(response):
+    assert response.status_code == 200
+    return response.get_json()["results"]
+
+
+def all_tasks(client):
+    return {task["id"]: task for task in client.get('/api/tasks').get_json()}
+
+
+def test_bulk_create_reports_each_item(client):
+    items = results(client.post('/api/tasks/bulk', json=[
+        {"entityName": "A", "taskType": "Call"},
+        {"entityName": "B"},
+        {"entityName": "C", "taskType": "Meeting", "status": None},
+    ]))
+
+    assert [item["status"] for item in items] == [201, 400, 201]
+    assert [item["index"] for item in items] == [0, 1, 2]
+    assert items[1]["error"] == "Missing entityName or taskType"
+    assert items[2]["task"]["status"] == "open"
+    assert set(all_tasks(client)) == {items[0]["task"]["id"], items[2]["task"]["id"]}
+
+
+def test_bulk_create_accepts_wrapped_payload(client):
+    items = results(client.post('/api/tasks/bulk', json={"tasks": [{"entityName": "A", "taskType": "Call"}]}))
+    assert items[0]["status"] == 201
+
+
+def test_bulk_rejects_non_list_body(client):
+    assert client.post('/api/tasks/bulk', json={"entityName": "A"}).status_code == 400
+    assert client.put('/api/tasks/bulk', json={"tasks": "nope"}).status_code == 400
+    assert client.delete('/api/tasks/bulk', json={"ids": 5}).status_code == 400
+
+
+def test_bulk_create_rejects_invalid_fields_per_item(client):
+    items = results(client.post('/api/tasks/bulk', json=[
+        {"entityName": {"nested": True}, "taskType": "Call"},
+        {"entityName": "x" * 101, "taskType": "Call"},
+        {"entityName": "A", "taskType": "Call", "note": 12},
+        "not an object",
+        {"entityName": "ok", "taskType": "Call"},
+    ]))
+
+    assert [item["status"] for item in items] == [400, 400, 400, 400, 201]
+    assert items[0]["error"] == "entityName must be a string"
+    assert items[1]["error"] == "entityName must be at most 100 characters"
+    assert items[2]["error"] == "note must be a string"
+    assert len(all_tasks(client)) == 1
+
+
+def test_bulk_create_commits_partial_batches(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_BATCH_SIZE', 2)
+    items = results(client.post('/api/tasks/bulk', json=[
+        {"entityName": f"E{i}", "taskType": "Call"} for i in range(5)
+    ]))
+
+    assert [item["status"] for item in items] == [201] * 5
+    assert len(all_tasks(client)) == 5
+
+
+def test_bulk_update_status_change_semantics(client, create_task):
+    unchanged = create_task(status="open")
+    changed = create_task(status="open")
+
+    items = results(client.put('/api/tasks/bulk', json=[
+        {"id": unchanged["id"], "status": "open", "note": "same status"},
+        {"id": changed["id"], "status": "closed"},
+    ]))
+
+    assert [item["status"] for item in items] == [200, 200]
+    tasks = all_tasks(client)
+    assert tasks[unchanged["id"]]["note"] == "same status"
+    assert tasks[unchanged["id"]]["lastStatusChangeDate"] == unchanged["lastStatusChangeDate"]
+    assert tasks[changed["id"]]["status"] == "closed"
+    assert tasks[changed["id"]]["lastStatusChangeDate"] != changed["lastStatusChangeDate"]
+    assert items[1]["task"]["lastStatusChangeDate"] == tasks[changed["id"]]["lastStatusChangeDate"]
+
+
+def test_bulk_update_rejects_invalid_items(client, create_task):
+    task = create_task()
+
+    items = results(client.put('/api/tasks/bulk', json=[
+        {"id": task["id"], "status": None},
+        {"id": task["id"], "note": ["x"]},
+        {"id": 42},
+        {"note": "no id"},
+        {"id": "missing"},
+        {"id": task["id"], "note": None},
+    ]))
+
+    assert [item["status"] for item in items] == [400, 400, 400, 400, 404, 200]
+    assert items[0]["error"] == "status cannot be null"
+    assert all_tasks(client)[task["id"]]["status"] == "open"
+
+
+def test_bulk_update_across_batches(app, client, create_task, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_BATCH_SIZE', 2)
+    tasks = [create_task() for _ in range(3)]
+
+    items = results(client.put('/api/tasks/bulk', json=[{"id": t["id"], "note": "bulk"} for t in tasks]))
+
+    assert [item["status"] for item in items] == [200] * 3
+    assert {t["note"] for t in all_tasks(client).values()} == {"bulk"}
+
+
+def test_bulk_delete_reports_each_id(client, create_task):
+    first, second = create_task(), create_task()
+
+    items = results(client.delete('/api/tasks/bulk', json={"ids": [
+        first["id"], {"a": 1}, 7, "missing", first["id"], second["id"],
+    ]}))
+
+    assert [item["status"] for item in items] == [200, 400, 400, 404, 404, 200]
+    assert items[1]["error"] == "id must be a string"
+    assert all_tasks(client) == {}
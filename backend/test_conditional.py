@@ -0,0 +1,141 @@
+# backend/test_conditional.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db, ResponseCache, TableVersion, response_cache
+
+
+@pytest.fixture
+def settle(app):
+    """Backdate the task table version so Last-Modified is outside the current second."""
+    def settle(seconds=10):
+        with app.app_context():
+            db.session.execute(db.update(TableVersion).where(TableVersion.name == 'task')
+                               .values(updated_at=datetime.utcnow() - timedelta(seconds=seconds)))
+            db.session.commit()
+    return settle
+
+
+def get(client, path, **headers):
+    response = client.get(path, headers=headers)
+    response.get_data()
+    response.close()
+    return response
+
+
+@pytest.mark.parametrize('path', ['/api/tasks', '/api/tasks?limit=5', '/api/tasks/facets'])
+def test_etag_round_trip(client, create_task, path):
+    create_task()
+    first = get(client, path)
+    assert first.status_code == 200
+    assert first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    again = get(client, path, **{"If-None-Match": first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == first.headers['ETag']
+
+
+def test_etag_changes_after_write(client, create_task):
+    task = create_task()
+    etag = get(client, '/api/tasks').headers['ETag']
+
+    client.put(f'/api/tasks/{task["id"]}', json={"note": "changed"})
+
+    response = get(client, '/api/tasks', **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()[0]["note"] == "changed"
+
+
+def test_etag_differs_per_query_and_accept(client, create_task):
+    create_task()
+    plain = get(client, '/api/tasks').headers['ETag']
+    assert get(client, '/api/tasks?status=open').headers['ETag'] != plain
+    assert get(client, '/api/tasks', Accept='application/x-ndjson').headers['ETag'] != plain
+
+
+def test_single_task_etag(client, create_task):
+    task = create_task()
+    first = get(client, f'/api/tasks/{task["id"]}')
+    assert first.status_code == 200
+
+    assert get(client, f'/api/tasks/{task["id"]}', **{"If-None-Match": first.headers['ETag']}).status_code == 304
+    assert get(client, '/api/tasks/missing').status_code == 404
+
+
+def test_paginated_body_served_from_cache(client, create_task):
+    create_task()
+    first = get(client, '/api/tasks?limit=5')
+    assert len(response_cache.entries) == 1
+    assert get(client, '/api/tasks?limit=5').data == first.data
+
+
+def test_streamed_listing_not_cached(client, create_task):
+    create_task()
+    assert get(client, '/api/tasks').status_code == 200
+    assert len(response_cache.entries) == 0
+
+
+def test_no_last_modified_within_same_second(client, create_task):
+    create_task()
+    response = get(client, '/api/tasks')
+    assert 'Last-Modified' not in response.headers
+    assert response.headers['ETag']
+
+
+def test_if_modified_since(client, create_task, settle):
+    create_task()
+    settle()
+    first = get(client, '/api/tasks')
+    last_modified = first.headers['Last-Modified']
+
+    assert get(client, '/api/tasks', **{"If-Modified-Since": last_modified}).status_code == 304
+
+    create_task()
+    assert get(client, '/api/tasks', **{"If-Modified-Since": last_modified}).status_code == 200
+
+
+def test_if_modified_since_same_second_write_not_stale(client, create_task, settle):
+    # A write in the same second as the previous Last-Modified must not produce a 304
+    create_task()
+    settle(0.2)
+    stale = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+    create_task()
+    assert get(client, '/api/tasks', **{"If-Modified-Since": stale}).status_code == 200
+
+
+def test_if_none_match_takes_precedence(client, create_task, settle):
+    create_task()
+    settle()
+    first = get(client, '/api/tasks')
+    response = get(client, '/api/tasks', **{"If-None-Match": '"other"',
+                                             "If-Modified-Since": first.headers['Last-Modified']})
+    assert response.status_code == 200
+
+
+def test_response_cache_bounded_by_bytes():
+    cache = ResponseCache(max_bytes=10)
+    cache.set('a', (b'1234', 'application/json'))
+    cache.set('b', (b'1234', 'application/json'))
+    cache.get('a') # a is now the most recently used
+    cache.set('c', (b'1234', 'application/json'))
+
+    assert list(cache.entries) == ['a', 'c']
+    assert cache.size == 8
+
+    cache.set('a', (b'12345678', 'application/json'))
+    assert list(cache.entries) == ['a']
+    assert cache.size == 8
+
+    cache.set('big', (b'x' * 11, 'application/json'))
+    assert 'big' not in cache.entries
+
+
+def test_disabled_response_cache_stores_nothing():
+    cache = ResponseCache(max_bytes=0)
+    cache.set('a', (b'1', 'application/json'))
+    assert cache.entries == {}
+    assert cache.size == 0
@@ -0,0 +1,99 @@
+# backend/test_events.py
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+from app import db, DatabaseBroker, TaskEvent
+
+
+@pytest.fixture
+def broker(app, monkeypatch):
+    # The default backend; conftest runs everything else on LocalBroker
+    broker = DatabaseBroker()
+    monkeypatch.setattr(app_module, 'task_events', broker)
+    return broker
+
+
+def events(app, broker):
+    with app.app_context():
+        return [{key: value for key, value in e.items() if key != "id"} for e in broker.replay(0)]
+
+
+def add_event(app, age):
+    with app.app_context():
+        db.session.add(TaskEvent(created_at=datetime.utcnow() - timedelta(seconds=age), payload='{"type": "updated"}'))
+        db.session.commit()
+
+
+def test_single_writes_publish_task_ids(app, client, broker, create_task):
+    task = create_task()
+    client.put(f'/api/tasks/{task["id"]}', json={"note": "edited"})
+    client.delete(f'/api/tasks/{task["id"]}')
+
+    assert events(app, broker) == [
+        {"type": "created", "taskId": task["id"], "version": 1},
+        {"type": "updated", "taskId": task["id"], "version": 2},
+        {"type": "deleted", "taskId": task["id"], "version": 3},
+    ]
+
+
+def test_bulk_writes_publish_one_summary_per_batch(app, client, broker, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_BATCH_SIZE', 2)
+    created = client.post('/api/tasks/bulk', json=[{"entityName": f"E{i}", "taskType": "Call"} for i in range(5)])
+    ids = [item["task"]["id"] for item in created.get_json()["results"]]
+    client.put('/api/tasks/bulk', json=[{"id": task_id, "note": "bulk"} for task_id in ids[:3]] + [{"id": "missing"}])
+    client.delete('/api/tasks/bulk', json={"ids": ids})
+
+    assert events(app, broker) == [
+        {"type": "created", "count": 2, "version": 1},
+        {"type": "created", "count": 2, "version": 2},
+        {"type": "created", "count": 1, "version": 3},
+        {"type": "updated", "count": 2, "version": 4},
+        {"type": "updated", "count": 1, "version": 5},
+        {"type": "deleted", "count": 2, "version": 6},
+        {"type": "deleted", "count": 2, "version": 7},
+        {"type": "deleted", "count": 1, "version": 8},
+    ]
+
+
+def test_writes_prune_expired_events_without_subscribers(app, broker, create_task):
+    add_event(app, age=app.config['TASK_EVENTS_RETENTION'] + 60)
+    add_event(app, age=10)
+
+    create_task()
+
+    assert [e["type"] for e in events(app, broker)] == ["updated", "created"]
+    assert broker.poller is None
+
+
+def test_pruning_is_throttled(app, broker, create_task):
+    create_task()
+    add_event(app, age=app.config['TASK_EVENTS_RETENTION'] + 60)
+
+    create_task()
+    assert len(events(app, broker)) == 3
+
+    broker.pruned_at -= app.config['TASK_EVENTS_PRUNE_INTERVAL'] + 1
+    create_task()
+    assert len(events(app, broker)) == 3
+
+
+def test_event_ids_keep_increasing_after_pruning(app, broker, create_task):
+    create_task()
+    with app.app_context():
+        last_id = db.session.scalar(db.select(db.func.max(TaskEvent.id)))
+        db.session.execute(db.delete(TaskEvent))
+        db.session.commit()
+
+    create_task()
+
+    with app.app_context():
+        assert [e["id"] for e in broker.replay(0)] == [last_id + 1]
+
+
+def test_replay_after_last_event_id(app, broker, create_task):
+    first, second = create_task(), create_task()
+    with app.app_context():
+        first_id = broker.replay(0)[0]["id"]
+        assert [e["taskId"] for e in broker.replay(first_id)] == [second["id"]]
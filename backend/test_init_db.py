@@ -0,0 +1,68 @@
+# backend/test_init_db.py
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def init_db(database):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database}', TASK_EVENTS_BACKEND='local')
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'],
+                   cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+    return sqlite3.connect(database)
+
+
+def columns(connection, table):
+    return {row[1] for row in connection.execute(f'PRAGMA table_info({table})')}
+
+
+def indexes(connection, table):
+    return {row[1] for row in connection.execute(f'PRAGMA index_list({table})')}
+
+
+def head_revision():
+    from alembic.script import ScriptDirectory
+    from app import MIGRATIONS_DIR
+    return ScriptDirectory(MIGRATIONS_DIR).get_current_head()
+
+
+@pytest.fixture
+def legacy_database(tmp_path):
+    # The committed database was made by db.create_all() before any migration ran
+    database = tmp_path / 'site.db'
+    shutil.copy(os.path.join(BACKEND_DIR, 'instance', 'site.db'), database)
+    return database
+
+
+def test_init_db_upgrades_legacy_database(legacy_database):
+    before = sqlite3.connect(legacy_database).execute('SELECT count(*) FROM task').fetchone()[0]
+
+    connection = init_db(legacy_database)
+
+    assert {'updated_at', 'sync_version'} <= columns(connection, 'task')
+    assert connection.execute('SELECT version_num FROM alembic_version').fetchone()[0] == head_revision()
+    assert connection.execute('SELECT count(*) FROM task').fetchone()[0] == before
+    assert {'ix_task_contact_person_id', 'ix_task_sync_version'} <= indexes(connection, 'task')
+    assert 'ix_task_updated_at_id' not in indexes(connection, 'task')
+    assert connection.execute('SELECT count(*) FROM task WHERE updated_at = last_status_change_date').fetchone()[0] == before
+    assert connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_fts'").fetchone()
+
+
+def test_init_db_is_idempotent(legacy_database):
+    init_db(legacy_database)
+    connection = init_db(legacy_database)
+    assert connection.execute('SELECT version_num FROM alembic_version').fetchone()[0] == head_revision()
+
+
+def test_init_db_stamps_new_database(tmp_path):
+    connection = init_db(tmp_path / 'new.db')
+
+    assert {'updated_at', 'sync_version'} <= columns(connection, 'task')
+    assert 'ix_task_contact_person_id' in indexes(connection, 'task')
+    assert connection.execute('SELECT version_num FROM alembic_version').fetchone()[0] == head_revision()
+    assert connection.execute("SELECT version FROM table_version WHERE name = 'task'").fetchone() == (0,)
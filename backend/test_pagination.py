@@ -0,0 +1,133 @@
+# backend/test_pagination.py
+import base64
+import json
+
+import pytest
+
+SORT_KEYS = ['dateCreated', 'entityName', 'taskType', 'status', 'contactPerson', 'lastStatusChangeDate']
+
+
+@pytest.fixture
+def tasks(create_task):
+    # Repeated values so pages have to break ties on id; some contacts are null
+    return [create_task(entityName=f'Entity {i % 3}', taskType=['Call', 'Meeting'][i % 2],
+                        status=['open', 'closed'][i % 2] if i % 4 else None,
+                        contactPerson=[None, 'Alice', 'Bob'][i % 3])
+            for i in range(11)]
+
+
+def walk_pages(client, **params):
+    ids, cursor = [], None
+    for _ in range(20):
+        query = {**params, "limit": 3}
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get('/api/tasks', query_string=query)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body["tasks"]) <= 3
+        ids += [task["id"] for task in body["tasks"]]
+        cursor = body["nextCursor"]
+        if cursor is None:
+            return ids
+    pytest.fail('pagination did not terminate')
+
+
+def sort_value(task, sort_key):
+    # contactPerson sorts nulls as '' to match the coalesced sort column
+    return task[sort_key] or ''
+
+
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+@pytest.mark.parametrize('sort_key', SORT_KEYS)
+def test_cursor_round_trip(client, tasks, sort_key, order):
+    ids = walk_pages(client, sort=sort_key, order=order)
+
+    expected = sorted(tasks, key=lambda task: (sort_value(task, sort_key), task["id"]), reverse=order == 'desc')
+    assert ids == [task["id"] for task in expected]
+
+
+@pytest.mark.parametrize('sort_key', SORT_KEYS)
+def test_pages_match_unpaginated_listing(client, tasks, sort_key):
+    listing = client.get('/api/tasks', query_string={"sort": sort_key, "order": "desc"}).get_json()
+    assert walk_pages(client, sort=sort_key, order='desc') == [task["id"] for task in listing]
+
+
+def test_cursor_pages_respect_filters(client, tasks):
+    ids = walk_pages(client, sort='contactPerson', taskType='Call')
+    assert sorted(ids) == sorted(task["id"] for task in tasks if task["taskType"] == 'Call')
+
+
+def test_last_page_has_no_cursor(client, tasks):
+    body = client.get('/api/tasks', query_string={"limit": len(tasks)}).get_json()
+    assert len(body["tasks"]) == len(tasks)
+    assert body["nextCursor"] is None
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64 !!',
+    base64.urlsafe_b64encode(b'not json').decode(),
+    base64.urlsafe_b64encode(json.dumps({"a": 1}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(['yesterday', 'some-id']).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps([5, 'some-id']).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(['2024-01-01T00:00:00', ['x']]).encode()).decode(),
+])
+def test_invalid_cursor(client, tasks, cursor):
+    response = client.get('/api/tasks', query_string={"sort": "dateCreated", "limit": 3, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
+
+
+def encode(value, task_id):
+    return base64.urlsafe_b64encode(json.dumps([value, task_id]).encode()).decode()
+
+
+@pytest.mark.parametrize('sort_key', ['entityName', 'contactPerson', 'status'])
+@pytest.mark.parametrize('cursor', [
+    encode({"a": 1}, 'x'),
+    encode('a', ['x']),
+    encode('a', 5),
+    encode(5, 'some-id'),
+    encode(None, 'some-id'),
+])
+def test_cursor_with_wrong_types(client, tasks, sort_key, cursor):
+    response = client.get('/api/tasks', query_string={"sort": sort_key, "limit": 3, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
+
+
+@pytest.mark.parametrize('limit', ['abc', '-5', '0', '1.5', ''])
+def test_invalid_limit(client, tasks, limit):
+    response = client.get('/api/tasks', query_string={"limit": limit})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "limit must be a positive integer"}
+
+
+def test_limit_is_capped(client, tasks):
+    body = client.get('/api/tasks', query_string={"limit": 10_000}).get_json()
+    assert len(body["tasks"]) == len(tasks)
+
+
+def test_invalid_sort_and_order(client):
+    assert client.get('/api/tasks?sort=note&limit=3').status_code == 400
+    assert client.get('/api/tasks?order=sideways&limit=3').status_code == 400
+
+
+def test_date_filter(client, tasks):
+    day = tasks[0]["dateCreated"][:10]
+
+    body = client.get('/api/tasks', query_string={"date": day, "limit": 100}).get_json()
+    assert len(body["tasks"]) == len(tasks)
+
+    body = client.get('/api/tasks', query_string={"date": ['1999-01-01', day], "limit": 100}).get_json()
+    assert len(body["tasks"]) == len(tasks)
+
+    body = client.get('/api/tasks', query_string={"date": '1999-01-01', "limit": 100}).get_json()
+    assert body["tasks"] == []
+
+
+@pytest.mark.parametrize('date', ['2024-13-01', '01/02/2024', 'today'])
+def test_invalid_date_filter(client, date):
+    response = client.get('/api/tasks', query_string={"date": date, "limit": 3})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "date must be formatted as YYYY-MM-DD"}
@@ -0,0 +1,153 @@
+# backend/test_search.py
+import base64
+import json
+
+import pytest
+
+
+def search(client, **params):
+    response = client.get('/api/tasks', query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def search_ids(client, q, **params):
+    return [task["id"] for task in search(client, q=q, limit=100, **params)["tasks"]]
+
+
+def walk(client, **params):
+    ids, cursor = [], None
+    for _ in range(20):
+        body = search(client, limit=2, **params, **({"cursor": cursor} if cursor else {}))
+        ids += [task["id"] for task in body["tasks"]]
+        cursor = body["nextCursor"]
+        if cursor is None:
+            return ids
+    pytest.fail('pagination did not terminate')
+
+
+def test_matches_entity_contact_and_note(client, create_task):
+    by_entity = create_task(entityName='Invoice Corp')
+    by_contact = create_task(contactPerson='Ivy Invoice')
+    by_note = create_task(note='send the invoice')
+    create_task(note='nothing relevant')
+
+    assert sorted(search_ids(client, 'invoice')) == sorted([by_entity["id"], by_contact["id"], by_note["id"]])
+
+
+def test_results_ordered_by_relevance(client, create_task):
+    weak = create_task(note='invoice ' + ' '.join(['filler'] * 30))
+    strong = create_task(note='invoice invoice invoice')
+
+    assert search_ids(client, 'invoice') == [strong["id"], weak["id"]]
+
+
+def test_prefix_and_stemmed_matches(client, create_task):
+    task = create_task(note='quarterly renewals pending')
+
+    assert search_ids(client, 'quart') == [task["id"]]
+    assert search_ids(client, 'renewal') == [task["id"]]
+
+
+@pytest.mark.parametrize('q', ['!!!', '"', '*', '   ', '-- ;'])
+def test_punctuation_only_queries(client, create_task, q):
+    create_task(note='invoice')
+    body = search(client, q=q, limit=10)
+    # Whitespace-only q is ignored; anything else without words matches nothing
+    assert len(body["tasks"]) == (1 if not q.strip() else 0)
+    assert body["nextCursor"] is None
+
+
+@pytest.mark.parametrize('q', ['invoice OR renewal', 'NEAR(invoice renewal)', 'note:invoice'])
+def test_fts_syntax_is_treated_as_words(client, create_task, q):
+    # Every word is required, operators included, so none of these match
+    create_task(note='invoice')
+    assert search(client, q=q, limit=10)["tasks"] == []
+
+
+def test_unbalanced_quotes_are_ignored(client, create_task):
+    task = create_task(note='invoice')
+    assert search_ids(client, '"invoice') == [task["id"]]
+
+
+def test_index_follows_single_update_and_delete(client, create_task):
+    task = create_task(note='invoice')
+
+    client.put(f'/api/tasks/{task["id"]}', json={"note": "renewal"})
+    assert search_ids(client, 'invoice') == []
+    assert search_ids(client, 'renewal') == [task["id"]]
+
+    client.put(f'/api/tasks/{task["id"]}', json={"status": "closed"})
+    assert search_ids(client, 'renewal') == [task["id"]]
+
+    client.delete(f'/api/tasks/{task["id"]}')
+    assert search_ids(client, 'renewal') == []
+
+
+def test_index_follows_bulk_writes(client):
+    created = client.post('/api/tasks/bulk', json=[
+        {"entityName": "Acme", "taskType": "Call", "note": "invoice"},
+        {"entityName": "Globex", "taskType": "Call", "note": "invoice"},
+    ]).get_json()["results"]
+    first, second = (item["task"]["id"] for item in created)
+    assert sorted(search_ids(client, 'invoice')) == sorted([first, second])
+
+    client.put('/api/tasks/bulk', json=[{"id": first, "note": "renewal"}])
+    assert search_ids(client, 'invoice') == [second]
+    assert search_ids(client, 'renewal') == [first]
+
+    client.delete('/api/tasks/bulk', json={"ids": [first, second]})
+    assert search_ids(client, 'invoice') == []
+    assert search_ids(client, 'renewal') == []
+
+
+def test_search_combined_with_filters(client, create_task):
+    open_task = create_task(note='invoice', status='open')
+    create_task(note='invoice', status='closed')
+
+    assert search_ids(client, 'invoice', status='open') == [open_task["id"]]
+
+
+def test_relevance_pages_with_cursor(client, create_task):
+    # Identical notes tie on rank, so pages have to break ties on id
+    for repeat in [1, 1, 2, 3, 3, 1]:
+        create_task(note=' '.join(['invoice'] * repeat + ['filler'] * 5))
+    create_task(note='unrelated')
+
+    ranked = search_ids(client, 'invoice')
+    assert len(ranked) == 6
+    assert walk(client, q='invoice') == ranked
+
+
+def test_ranked_results_report_truncation(client, create_task):
+    for _ in range(3):
+        create_task(note='invoice')
+
+    body = search(client, q='invoice', limit=2)
+    assert len(body["tasks"]) == 2
+    assert body["nextCursor"] is not None
+
+    rest = search(client, q='invoice', limit=2, cursor=body["nextCursor"])
+    assert len(rest["tasks"]) == 1
+    assert rest["nextCursor"] is None
+
+
+@pytest.mark.parametrize('value', ['invoice', None, True, [1]])
+def test_invalid_relevance_cursor(client, create_task, value):
+    create_task(note='invoice')
+    cursor = base64.urlsafe_b64encode(json.dumps([value, 'some-id']).encode()).decode()
+
+    response = client.get('/api/tasks', query_string={"q": "invoice", "cursor": cursor})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
+
+
+def test_search_with_explicit_sort_pages_in_sort_order(client, create_task):
+    matches = [create_task(entityName=name, note='invoice') for name in ['Delta', 'Alpha', 'Charlie', 'Bravo']]
+    create_task(entityName='Echo', note='renewal')
+
+    ids = walk(client, q='invoice', sort='entityName')
+    assert ids == [task["id"] for task in sorted(matches, key=lambda task: task["entityName"])]
+
+    ids = walk(client, q='invoice', sort='entityName', order='desc')
+    assert ids == [task["id"] for task in sorted(matches, key=lambda task: task["entityName"], reverse=True)]
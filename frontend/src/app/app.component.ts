@@ -1,12 +1,14 @@
 // finstack-frontend-final/src/app/app.component.ts
-import { Component, OnInit } from '@angular/core';
+import { Component, OnDestroy, OnInit } from '@angular/core';
 import { CommonModule, formatDate } from '@angular/common';
 import { HttpClientModule } from '@angular/common/http';
 import { FormsModule, ReactiveFormsModule, FormBuilder, FormGroup, Validators } from '@angular/forms';
 import { RouterModule } from '@angular/router';
+import { Subscription } from 'rxjs';
+import { debounceTime } from 'rxjs/operators';
 
 import { TaskService } from './task.service';
-import { Task } from './task.model'; // Assuming Task model matches backend's to_dict output
+import { Task, TaskFacets } from './task.model'; // Assuming Task model matches backend's to_dict output
 
 @Component({
   standalone: true,
@@ -21,9 +23,12 @@ import { Task } from './task.model'; // Assuming Task model matches backend's to
     RouterModule
   ]
 })
-export class AppComponent implements OnInit {
+export class AppComponent implements OnInit, OnDestroy {
   title = 'Finstack Task List';
   tasks: Task[] = [];
+  facets: TaskFacets | null = null;
+  syncCursor: string | null = null;
+  private taskEventsSubscription: Subscription | null = null;
   editingTask: Task | null = null;
   showNewTaskModal: boolean = false;
 
@@ -81,6 +86,14 @@ export class AppComponent implements OnInit {
 
   ngOnInit(): void {
     this.loadTasks();
+    // Pull the delta whenever anyone changes a task; bursts (e.g. bulk imports) collapse into one sync
+    this.taskEventsSubscription = this.taskService.watchTaskEvents()
+      .pipe(debounceTime(300))
+      .subscribe(() => this.syncTasks());
+  }
+
+  ngOnDestroy(): void {
+    this.taskEventsSubscription?.unsubscribe();
   }
 
   getCurrentDateString(): string {
@@ -92,9 +105,10 @@ export class AppComponent implements OnInit {
   }
 
   loadTasks(): void {
-    this.taskService.getTasks().subscribe(
-      (tasks) => {
+    this.taskService.getTaskChanges().subscribe(
+      ({ tasks, cursor }) => {
         this.tasks = tasks;
+        this.syncCursor = cursor;
         console.log('Tasks received from backend:', this.tasks);
         this.applyFilters();
         this.sortTasks(this.sortColumn || 'dateCreated');
@@ -103,6 +117,41 @@ export class AppComponent implements OnInit {
         console.error('Error loading tasks:', error);
       }
     );
+    this.loadFacets();
+  }
+
+  // Applies only what changed since the last load instead of re-downloading every task
+  syncTasks(): void {
+    if (!this.syncCursor) {
+      this.loadTasks();
+      return;
+    }
+    this.taskService.getTaskChanges(this.syncCursor).subscribe(
+      (changes) => {
+        const deleted = new Set(changes.deleted);
+        const tasksById = new Map(
+          this.tasks.filter(task => !deleted.has(task.id)).map(task => [task.id, task] as [string, Task])
+        );
+        changes.tasks.forEach(task => tasksById.set(task.id, task));
+        this.tasks = [...tasksById.values()];
+        this.syncCursor = changes.cursor;
+        this.loadFacets();
+      },
+      (error) => {
+        console.error('Error syncing tasks:', error);
+      }
+    );
+  }
+
+  loadFacets(): void {
+    this.taskService.getTaskFacets().subscribe(
+      (facets) => {
+        this.facets = facets;
+      },
+      (error) => {
+        console.error('Error loading task facets:', error);
+      }
+    );
   }
 
   // --- REMOVED: toggleStatus method as it's no longer needed for a select dropdown ---
@@ -149,7 +198,7 @@ export class AppComponent implements OnInit {
       (createdTask) => {
         console.log('Task created successfully:', createdTask);
         this.newTaskForm.reset();
-        this.loadTasks();
+        this.syncTasks();
         this.showNewTaskModal = false;
       },
       (error) => {
@@ -221,7 +270,7 @@ export class AppComponent implements OnInit {
       (updatedTask) => {
         console.log('Task updated successfully:', updatedTask);
         this.cancelEdit();
-        this.loadTasks();
+        this.syncTasks();
         this.showNewTaskModal = false;
       },
       (error) => {
@@ -246,7 +295,7 @@ export class AppComponent implements OnInit {
         () => {
           console.log('Task deleted successfully.');
           this.cancelEdit();
-          this.loadTasks();
+          this.syncTasks();
         },
         (error) => {
           console.error('Error deleting task:', error);
@@ -388,10 +437,16 @@ export class AppComponent implements OnInit {
   }
 
   get uniqueEntityNames(): string[] {
+    if (this.facets) {
+      return this.facets.entityName.map(f => f.value);
+    }
     return [...new Set(this.tasks.map(task => task.entityName))].sort((a, b) => a.localeCompare(b));
   }
 
   get uniqueDates(): string[] {
+    if (this.facets) {
+      return this.facets.date.map(f => f.value);
+    }
     return [...new Set(this.tasks.map(task => formatDate(task.dateCreated, 'yyyy-MM-dd', 'en-US')))]
       .sort((a, b) => new Date(a).getTime() - new Date(b).getTime());
   }
@@ -401,6 +456,9 @@ export class AppComponent implements OnInit {
   }
 
   get uniqueContactPersons(): string[] {
+    if (this.facets) {
+      return this.facets.contactPerson.map(f => f.value).filter(Boolean);
+    }
     return [...new Set(this.tasks.map(task => task.contactPerson).filter(Boolean) as string[])]
            .sort((a, b) => a.localeCompare(b));
   }
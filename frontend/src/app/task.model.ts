@@ -11,4 +11,26 @@ export interface Task {
   note?: string;
   status: 'open' | 'closed';
   lastStatusChangeDate?: string; // This is the automatic status change timestamp
-}
\ No newline at end of file
+  updatedAt?: string;
+}
+
+export interface FacetValue {
+  value: string;
+  count: number;
+}
+
+// Delta returned by /api/tasks/changes
+export interface TaskChanges {
+  tasks: Task[];
+  deleted: string[];
+  cursor: string;
+}
+
+// Distinct values with counts, as returned by /api/tasks/facets
+export interface TaskFacets {
+  entityName: FacetValue[];
+  taskType: FacetValue[];
+  status: FacetValue[];
+  contactPerson: FacetValue[];
+  date: FacetValue[];
+}
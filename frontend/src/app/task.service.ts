@@ -2,7 +2,7 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
 import { Observable } from 'rxjs';
-import { Task } from './task.model';
+import { Task, TaskChanges, TaskFacets } from './task.model';
 
 @Injectable({
   providedIn: 'root'
@@ -16,6 +16,25 @@ export class TaskService {
     return this.http.get<Task[]>(`${this.apiUrl}/tasks`);
   }
 
+  getTaskChanges(since?: string): Observable<TaskChanges> {
+    const params: Record<string, string> = since ? { since } : {};
+    return this.http.get<TaskChanges>(`${this.apiUrl}/tasks/changes`, { params });
+  }
+
+  // Emits the event type ('created', 'updated' or 'deleted') for every change pushed by the server
+  watchTaskEvents(): Observable<string> {
+    return new Observable<string>(subscriber => {
+      const source = new EventSource(`${this.apiUrl}/tasks/stream`);
+      const onEvent = (event: MessageEvent) => subscriber.next(event.type);
+      ['created', 'updated', 'deleted'].forEach(type => source.addEventListener(type, onEvent));
+      return () => source.close();
+    });
+  }
+
+  getTaskFacets(): Observable<TaskFacets> {
+    return this.http.get<TaskFacets>(`${this.apiUrl}/tasks/facets`);
+  }
+
   createTask(task: Partial<Task>): Observable<Task> {
     return this.http.post<Task>(`${this.apiUrl}/tasks`, task);
   }